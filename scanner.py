@@ -5,13 +5,187 @@ AWS Security Scanner - Main CLI Entry Point
 
 import click
 import json
+import sys
 from datetime import datetime
+from typing import Optional
 from colorama import Fore, Style, init
+from jinja2 import Environment
 from scanners.s3_scanner import S3Scanner
+from scanners.severity import Severity, summarize
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
+# Severity lookup tables shared by the console and report printers
+_SEVERITY_COLORS = {
+    'CRITICAL': Fore.RED,
+    'HIGH': Fore.LIGHTRED_EX,
+    'MEDIUM': Fore.YELLOW,
+    'LOW': Fore.BLUE
+}
+_SEVERITY_CSS = {s.label: s.css_class for s in Severity}
+_SEVERITY_ORDER = {s.label: s for s in Severity}
+
+
+def _severity_css(severity: str) -> str:
+    """Get the HTML report CSS class for a severity level"""
+    return _SEVERITY_CSS.get(severity) or severity.lower()
+
+
+# HTML report template, compiled once at import time
+_ENV = Environment(autoescape=True)
+_ENV.filters['severity_css'] = _severity_css
+_HTML_TEMPLATE = _ENV.from_string("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>AWS Security Scan Report</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background-color: white;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #2c3e50;
+            border-bottom: 3px solid #3498db;
+            padding-bottom: 10px;
+        }
+        .summary {
+            display: grid;
+            grid-template-columns: repeat(4, 1fr);
+            gap: 15px;
+            margin: 20px 0;
+        }
+        .summary-box {
+            padding: 20px;
+            border-radius: 5px;
+            text-align: center;
+        }
+        .critical { background-color: #e74c3c; color: white; }
+        .high { background-color: #e67e22; color: white; }
+        .medium { background-color: #f39c12; color: white; }
+        .low { background-color: #3498db; color: white; }
+        .finding {
+            border-left: 4px solid;
+            padding: 20px;
+            margin: 15px 0;
+            background-color: #ffffff;
+            border-radius: 4px;
+            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+        }
+        .finding.critical { border-left-color: #e74c3c; }
+        .finding.high { border-left-color: #e67e22; }
+        .finding.medium { border-left-color: #f39c12; }
+        .finding.low { border-left-color: #3498db; }
+        .finding-header {
+            font-weight: bold;
+            font-size: 1.2em;
+            margin-bottom: 15px;
+            color: #2c3e50;
+        }
+        .badge {
+            display: inline-block;
+            padding: 5px 12px;
+            border-radius: 3px;
+            font-size: 0.85em;
+            font-weight: bold;
+            margin-right: 10px;
+            color: white;
+        }
+        .badge.critical { background-color: #e74c3c; }
+        .badge.high { background-color: #e67e22; }
+        .badge.medium { background-color: #f39c12; }
+        .badge.low { background-color: #3498db; }
+        .remediation {
+            background-color: #ecf0f1;
+            padding: 15px;
+            margin-top: 15px;
+            border-radius: 4px;
+            font-family: 'Courier New', monospace;
+            font-size: 0.9em;
+            color: #2c3e50;
+            border: 1px solid #bdc3c7;
+        }
+        .timestamp {
+            color: #7f8c8d;
+            font-size: 0.9em;
+        }
+        h2 {
+            color: #2c3e50;
+            margin-top: 30px;
+            margin-bottom: 20px;
+        }
+        .finding p {
+            color: #34495e;
+            line-height: 1.6;
+            margin: 8px 0;
+        }
+        .finding strong {
+            color: #2c3e50;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>AWS Security Scan Report</h1>
+        <p class="timestamp">Generated: {{ scan_date }}</p>
+        
+        <div class="summary">
+            <div class="summary-box critical">
+                <h2>{{ summary.get('CRITICAL', 0) }}</h2>
+                <p>Critical</p>
+            </div>
+            <div class="summary-box high">
+                <h2>{{ summary.get('HIGH', 0) }}</h2>
+                <p>High</p>
+            </div>
+            <div class="summary-box medium">
+                <h2>{{ summary.get('MEDIUM', 0) }}</h2>
+                <p>Medium</p>
+            </div>
+            <div class="summary-box low">
+                <h2>{{ summary.get('LOW', 0) }}</h2>
+                <p>Low</p>
+            </div>
+        </div>
+        
+        <h2>Findings</h2>
+        {% for f in findings %}
+        {% set severity = f.severity|default('UNKNOWN') %}
+        <div class="finding {{ severity|severity_css }}">
+            <div class="finding-header">
+                <span class="badge {{ severity|severity_css }}">{{ severity }}</span>
+                {{ f.issue|default('Unknown Issue') }}
+            </div>
+            <p><strong>Service:</strong> {{ f.service|default('N/A') }}</p>
+            <p><strong>Resource:</strong> {{ f.resource|default('N/A') }}</p>
+            <p><strong>Description:</strong> {{ f.description|default('N/A') }}</p>
+            <div class="remediation">
+                <strong>Remediation:</strong><br>
+                {{ f.remediation|default('N/A') }}
+            </div>
+        </div>
+        {% endfor %}
+    </div>
+</body>
+</html>
+""")
+
 
 def print_banner():
     """Print ASCII banner"""
@@ -27,228 +201,89 @@ def print_banner():
 
 def get_severity_color(severity: str) -> str:
     """Get color code for severity level"""
-    color_map = {
-        'CRITICAL': Fore.RED,
-        'HIGH': Fore.LIGHTRED_EX,
-        'MEDIUM': Fore.YELLOW,
-        'LOW': Fore.BLUE
-    }
-    return color_map.get(severity, Fore.WHITE)
+    return _SEVERITY_COLORS.get(severity, Fore.WHITE)
 
 
-def print_finding(finding: dict, index: int):
-    """Pretty print a security finding"""
+def format_finding(finding: dict, index: int) -> str:
+    """Render a security finding for console output"""
     severity = finding.get('severity', 'UNKNOWN')
     color = get_severity_color(severity)
     
-    print(f"\n{color}{'═' * 70}")
-    print(f"[{index + 1}] [{severity}] {finding.get('issue', 'Unknown Issue')}")
-    print(f"{'═' * 70}{Style.RESET_ALL}")
-    
-    print(f"  Service:     {finding.get('service', 'N/A')}")
-    print(f"  Resource:    {finding.get('resource', 'N/A')}")
-    print(f"  Description: {finding.get('description', 'N/A')}")
-    print(f"\n  Remediation:")
-    print(f"  {finding.get('remediation', 'N/A')}")
+    return "\n".join([
+        f"\n{color}{'═' * 70}{Style.RESET_ALL}",
+        f"[{index + 1}] [{severity}] {finding.get('issue', 'Unknown Issue')}",
+        f"{'═' * 70}{Style.RESET_ALL}",
+        f"  Service:     {finding.get('service', 'N/A')}",
+        f"  Resource:    {finding.get('resource', 'N/A')}",
+        f"  Description: {finding.get('description', 'N/A')}",
+        f"\n  Remediation:",
+        f"  {finding.get('remediation', 'N/A')}",
+    ]) + "\n"
 
 
 def print_summary(summary: dict):
     """Print summary of findings"""
     total = sum(summary.values())
     
-    print(f"\n{Fore.CYAN}{'═' * 70}")
-    print(f"SCAN SUMMARY")
-    print(f"{'═' * 70}{Style.RESET_ALL}\n")
+    lines = [
+        f"\n{Fore.CYAN}{'═' * 70}{Style.RESET_ALL}",
+        "SCAN SUMMARY",
+        f"{'═' * 70}{Style.RESET_ALL}\n",
+    ]
     
     if total == 0:
-        print(f"{Fore.GREEN}✓ No security issues found! Your AWS environment looks good.{Style.RESET_ALL}\n")
-        return
+        lines.append(f"{Fore.GREEN}✓ No security issues found! Your AWS environment looks good.{Style.RESET_ALL}\n")
+    else:
+        lines += [
+            f"Total Issues Found: {total}\n",
+            f"{_SEVERITY_COLORS['CRITICAL']}  Critical: {summary.get('CRITICAL', 0)}{Style.RESET_ALL}",
+            f"{_SEVERITY_COLORS['HIGH']}  High:     {summary.get('HIGH', 0)}{Style.RESET_ALL}",
+            f"{_SEVERITY_COLORS['MEDIUM']}  Medium:   {summary.get('MEDIUM', 0)}{Style.RESET_ALL}",
+            f"{_SEVERITY_COLORS['LOW']}  Low:      {summary.get('LOW', 0)}{Style.RESET_ALL}\n",
+        ]
     
-    print(f"Total Issues Found: {total}\n")
-    print(f"{Fore.RED}  Critical: {summary.get('CRITICAL', 0)}{Style.RESET_ALL}")
-    print(f"{Fore.LIGHTRED_EX}  High:     {summary.get('HIGH', 0)}{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}  Medium:   {summary.get('MEDIUM', 0)}{Style.RESET_ALL}")
-    print(f"{Fore.BLUE}  Low:      {summary.get('LOW', 0)}{Style.RESET_ALL}\n")
+    sys.stdout.write("\n".join(lines) + "\n")
+
 
+def _json_default(obj):
+    """Serialize values the stdlib json module does not handle natively"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
-def generate_json_report(findings: list, output_file: str):
-    """Generate JSON report of findings"""
+
+def generate_json_report(findings: list, output_file: str, scan_date: Optional[datetime] = None):
+    """Generate JSON report of findings (scan_date defaults to now)"""
     report = {
-        'scan_date': datetime.now().isoformat(),
+        'scan_date': scan_date or datetime.now(),
         'scanner_version': '1.0',
         'total_findings': len(findings),
         'findings': findings
     }
     
-    with open(output_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        # Write raw UTF-8 like orjson does, so both paths produce the same bytes
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(report, indent=2, ensure_ascii=False, default=_json_default) + '\n')
     
     print(f"{Fore.GREEN}✓ JSON report saved to: {output_file}{Style.RESET_ALL}")
 
 
-def generate_html_report(findings: list, summary: dict, output_file: str):
-    """Generate HTML report of findings"""
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>AWS Security Scan Report</title>
-        <style>
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }}
-            .container {{
-                max-width: 1200px;
-                margin: 0 auto;
-                background-color: white;
-                padding: 30px;
-                border-radius: 8px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            h1 {{
-                color: #2c3e50;
-                border-bottom: 3px solid #3498db;
-                padding-bottom: 10px;
-            }}
-            .summary {{
-                display: grid;
-                grid-template-columns: repeat(4, 1fr);
-                gap: 15px;
-                margin: 20px 0;
-            }}
-            .summary-box {{
-                padding: 20px;
-                border-radius: 5px;
-                text-align: center;
-            }}
-            .critical {{ background-color: #e74c3c; color: white; }}
-            .high {{ background-color: #e67e22; color: white; }}
-            .medium {{ background-color: #f39c12; color: white; }}
-            .low {{ background-color: #3498db; color: white; }}
-            .finding {{
-                border-left: 4px solid;
-                padding: 20px;
-                margin: 15px 0;
-                background-color: #ffffff;
-                border-radius: 4px;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            }}
-            .finding.critical {{ border-left-color: #e74c3c; }}
-            .finding.high {{ border-left-color: #e67e22; }}
-            .finding.medium {{ border-left-color: #f39c12; }}
-            .finding.low {{ border-left-color: #3498db; }}
-            .finding-header {{
-                font-weight: bold;
-                font-size: 1.2em;
-                margin-bottom: 15px;
-                color: #2c3e50;
-            }}
-            .badge {{
-                display: inline-block;
-                padding: 5px 12px;
-                border-radius: 3px;
-                font-size: 0.85em;
-                font-weight: bold;
-                margin-right: 10px;
-                color: white;
-            }}
-            .badge.critical {{ background-color: #e74c3c; }}
-            .badge.high {{ background-color: #e67e22; }}
-            .badge.medium {{ background-color: #f39c12; }}
-            .badge.low {{ background-color: #3498db; }}
-            .remediation {{
-                background-color: #ecf0f1;
-                padding: 15px;
-                margin-top: 15px;
-                border-radius: 4px;
-                font-family: 'Courier New', monospace;
-                font-size: 0.9em;
-                color: #2c3e50;
-                border: 1px solid #bdc3c7;
-            }}
-            .timestamp {{
-                color: #7f8c8d;
-                font-size: 0.9em;
-            }}
-            h2 {{
-                color: #2c3e50;
-                margin-top: 30px;
-                margin-bottom: 20px;
-            }}
-            .finding p {{
-                color: #34495e;
-                line-height: 1.6;
-                margin: 8px 0;
-            }}
-            .finding strong {{
-                color: #2c3e50;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>AWS Security Scan Report</h1>
-            <p class="timestamp">Generated: {scan_date}</p>
-            
-            <div class="summary">
-                <div class="summary-box critical">
-                    <h2>{critical}</h2>
-                    <p>Critical</p>
-                </div>
-                <div class="summary-box high">
-                    <h2>{high}</h2>
-                    <p>High</p>
-                </div>
-                <div class="summary-box medium">
-                    <h2>{medium}</h2>
-                    <p>Medium</p>
-                </div>
-                <div class="summary-box low">
-                    <h2>{low}</h2>
-                    <p>Low</p>
-                </div>
-            </div>
-            
-            <h2>Findings</h2>
-            {findings_html}
-        </div>
-    </body>
-    </html>
-    """
-    
-    findings_html = ""
-    for i, finding in enumerate(findings, 1):
-        severity = finding.get('severity', 'UNKNOWN').lower()
-        findings_html += f"""
-        <div class="finding {severity}">
-            <div class="finding-header">
-                <span class="badge {severity}">{finding.get('severity', 'UNKNOWN')}</span>
-                {finding.get('issue', 'Unknown Issue')}
-            </div>
-            <p><strong>Service:</strong> {finding.get('service', 'N/A')}</p>
-            <p><strong>Resource:</strong> {finding.get('resource', 'N/A')}</p>
-            <p><strong>Description:</strong> {finding.get('description', 'N/A')}</p>
-            <div class="remediation">
-                <strong>Remediation:</strong><br>
-                {finding.get('remediation', 'N/A')}
-            </div>
-        </div>
-        """
-    
-    html_content = html_template.format(
-        scan_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        critical=summary.get('CRITICAL', 0),
-        high=summary.get('HIGH', 0),
-        medium=summary.get('MEDIUM', 0),
-        low=summary.get('LOW', 0),
-        findings_html=findings_html
+def generate_html_report(findings: list, summary: dict, output_file: str,
+                         scan_date: Optional[datetime] = None):
+    """Generate HTML report of findings (scan_date defaults to now)"""
+    stream = _HTML_TEMPLATE.stream(
+        scan_date=(scan_date or datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
+        summary=summary,
+        findings=findings
     )
     
+    # Write rendered fragments as they are produced instead of building the whole document
     with open(output_file, 'w') as f:
-        f.write(html_content)
+        stream.dump(f)
     
     print(f"{Fore.GREEN} HTML report saved to: {output_file}{Style.RESET_ALL}")
 
@@ -268,6 +303,8 @@ def main(mock, services, output, report_file, verbose):
     Scan your AWS environment for common security misconfigurations.
     """
     print_banner()
+    # Timestamp shared by every report produced in this run
+    scan_started = datetime.now()
     
     if mock:
         print(f"{Fore.YELLOW}ℹ Running in MOCK mode (using sample data){Style.RESET_ALL}")
@@ -292,31 +329,25 @@ def main(mock, services, output, report_file, verbose):
     # TODO: Add EC2 scanner
     # TODO: Add IAM scanner
     
-    # Sort findings by severity
-    severity_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
-    all_findings.sort(key=lambda x: severity_order.get(x.get('severity', 'LOW'), 4))
+    # Sort findings by severity for human-readable output; JSON consumers sort themselves
+    if output != 'json' and len(all_findings) > 1:
+        all_findings.sort(key=lambda f: _SEVERITY_ORDER.get(f.get('severity', 'LOW'), len(Severity)))
     
     # Generate output based on format
     if output == 'console':
-        for i, finding in enumerate(all_findings):
-            print_finding(finding, i)
+        # Render every finding first and write them in one go
+        sys.stdout.write("".join(format_finding(finding, i) for i, finding in enumerate(all_findings)))
         
         # Generate summary
-        s3_scanner = S3Scanner(mock_mode=mock)
-        s3_scanner.findings = all_findings
-        summary = s3_scanner.get_summary()
-        print_summary(summary)
+        print_summary(summarize(all_findings))
         
     elif output == 'json':
         json_file = f"{report_file}.json"
-        generate_json_report(all_findings, json_file)
+        generate_json_report(all_findings, json_file, scan_date=scan_started)
         
     elif output == 'html':
         html_file = f"{report_file}.html"
-        s3_scanner = S3Scanner(mock_mode=mock)
-        s3_scanner.findings = all_findings
-        summary = s3_scanner.get_summary()
-        generate_html_report(all_findings, summary, html_file)
+        generate_html_report(all_findings, summarize(all_findings), html_file, scan_date=scan_started)
     
     # Print recommendation
     if len(all_findings) > 0:
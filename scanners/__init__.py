@@ -3,5 +3,6 @@ Security scanners package
 """
 
 from .s3_scanner import S3Scanner
+from .severity import Severity, summarize
 
-__all__ = ['S3Scanner']
+__all__ = ['S3Scanner', 'Severity', 'summarize']
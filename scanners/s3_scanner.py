@@ -4,16 +4,75 @@ Checks for common S3 misconfigurations and security issues
 """
 
 import json
-from typing import List, Dict, Any
+import os
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, Optional, Sequence
+
+from .severity import Severity, summarize
+
+# Callback that records a single finding
+AddFinding = Callable[[Dict[str, Any]], None]
+
+# Bucket name keywords that suggest sensitive data (encryption check)
+_SENSITIVE_ENC_RE = re.compile(r'financial|customer|personal|pii|records|backup', re.IGNORECASE)
+# Bucket name keywords that suggest data needing recovery/compliance (versioning check)
+_SENSITIVE_VER_RE = re.compile(r'backup|records|financial|compliance', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1)
+def _load_mock_file() -> Dict[str, Any]:
+    """Parse the mock S3 data file once and cache the result"""
+    # Get the directory where the scanner is located
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    mock_file = os.path.join(base_dir, 'mock_data', 's3_mock.json')
+    with open(mock_file, 'r') as f:
+        return json.load(f)
+
+
+def _is_public_group(grant: Dict[str, Any]) -> bool:
+    """Check if an ACL grant is given to the AllUsers group"""
+    grantee = grant.get('grantee', {})
+    return grantee.get('type') == 'Group' and 'AllUsers' in grantee.get('uri', '')
 
 
 class S3Scanner:
     """Scanner for S3 bucket security issues"""
     
-    SEVERITY_CRITICAL = "CRITICAL"
-    SEVERITY_HIGH = "HIGH"
-    SEVERITY_MEDIUM = "MEDIUM"
-    SEVERITY_LOW = "LOW"
+    SEVERITY_CRITICAL = Severity.CRITICAL.label
+    SEVERITY_HIGH = Severity.HIGH.label
+    SEVERITY_MEDIUM = Severity.MEDIUM.label
+    SEVERITY_LOW = Severity.LOW.label
+    
+    # Remediation text per check, formatted with the bucket name
+    _REMEDIATION_PUBLIC_ACCESS = (
+        "Block public access for bucket '{name}' unless absolutely necessary. "
+        "Use AWS CLI: aws s3api put-public-access-block --bucket {name} "
+        "--public-access-block-configuration BlockPublicAcls=true,IgnorePublicAcls=true,"
+        "BlockPublicPolicy=true,RestrictPublicBuckets=true"
+    )
+    _REMEDIATION_ENCRYPTION = (
+        "Enable default encryption for bucket '{name}'. "
+        "Use AWS CLI: aws s3api put-bucket-encryption --bucket {name} "
+        "--server-side-encryption-configuration "
+        "'{{\"Rules\":[{{\"ApplyServerSideEncryptionByDefault\":{{\"SSEAlgorithm\":\"AES256\"}}}}]}}'"
+    )
+    _REMEDIATION_VERSIONING = (
+        "Enable versioning for bucket '{name}'. "
+        "Use AWS CLI: aws s3api put-bucket-versioning --bucket {name} "
+        "--versioning-configuration Status=Enabled"
+    )
+    _REMEDIATION_LOGGING = (
+        "Enable access logging for bucket '{name}'. "
+        "First create a logging bucket, then use AWS CLI: "
+        "aws s3api put-bucket-logging --bucket {name} "
+        "--bucket-logging-status file://logging.json"
+    )
+    _REMEDIATION_PUBLIC_POLICY = (
+        "Review and restrict the bucket policy for '{name}'. "
+        "Remove or narrow the Principal field. Consider using AWS Organizations "
+        "SCPs to prevent public bucket policies."
+    )
     
     def __init__(self, mock_mode: bool = True):
         """
@@ -26,13 +85,13 @@ class S3Scanner:
         self.findings = []
     
     def load_mock_data(self) -> Dict[str, Any]:
-        """Load mock S3 data from JSON file"""
-        import os
-        # Get the directory where the scanner is located
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        mock_file = os.path.join(base_dir, 'mock_data', 's3_mock.json')
-        with open(mock_file, 'r') as f:
-            return json.load(f)
+        """
+        Load mock S3 data from JSON file
+        
+        The parsed data is cached and shared between scanners, so callers
+        must treat it as read-only.
+        """
+        return _load_mock_file()
     
     def scan(self) -> List[Dict[str, Any]]:
         """
@@ -41,8 +100,6 @@ class S3Scanner:
         Returns:
             List of security findings
         """
-        self.findings = []
-        
         if self.mock_mode:
             data = self.load_mock_data()
             buckets = data.get('buckets', [])
@@ -50,124 +107,121 @@ class S3Scanner:
             # TODO: Need to implement real AWS API calls using boto3
             buckets = []
         
+        findings = []
         for bucket in buckets:
-            self._check_public_access(bucket)
-            self._check_encryption(bucket)
-            self._check_versioning(bucket)
-            self._check_logging(bucket)
-            self._check_public_policy(bucket)
+            findings.extend(self._scan_bucket(bucket))
         
-        return self.findings
+        self.findings = findings
+        return findings
     
-    def _check_public_access(self, bucket: Dict[str, Any]) -> None:
+    def _scan_bucket(self, bucket: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run all checks against a single bucket, reading each field once
+        
+        Returns:
+            Findings for this bucket (self.findings is not modified)
+        """
+        findings = []
+        add = findings.append
+        get = bucket.get
+        bucket_name = get('name')
+        grants = (get('acl') or {}).get('grants', ())
+        tags = get('tags', ())
+        encryption = get('encryption')
+        versioning = get('versioning', 'Disabled')
+        logging = get('logging', False)
+        policy = get('bucket_policy')
+        
+        # Checks stay separate methods; their call overhead is small next to the checks themselves
+        self._check_public_access(add, bucket_name, grants, tags)
+        self._check_encryption(add, bucket_name, encryption)
+        self._check_versioning(add, bucket_name, versioning)
+        self._check_logging(add, bucket_name, logging)
+        self._check_public_policy(add, bucket_name, policy)
+        
+        return findings
+    
+    def _check_public_access(self, add: AddFinding, bucket_name: str, grants: Sequence[Dict[str, Any]],
+                             tags: Sequence[Dict[str, Any]]) -> None:
         """Check if bucket allows public access via ACLs"""
-        bucket_name = bucket.get('name')
-        acl = bucket.get('acl', {})
-        grants = acl.get('grants', [])
+        # Check if bucket has public read access; one finding per bucket is enough
+        public_grant = next((grant for grant in grants if _is_public_group(grant)), None)
+        if public_grant is None:
+            return
         
-        # Check if bucket has public read access
-        for grant in grants:
-            grantee = grant.get('grantee', {})
-            if grantee.get('type') == 'Group' and 'AllUsers' in grantee.get('uri', ''):
-                # Check if this is intentional (tagged as public website)
-                tags = bucket.get('tags', [])
-                is_public_website = any(
-                    tag.get('key') == 'Purpose' and 'public' in tag.get('value', '').lower()
-                    for tag in tags
-                )
-                
-                if is_public_website:
-                    severity = self.SEVERITY_LOW
-                    description = f"S3 bucket '{bucket_name}' is publicly accessible (tagged as public website)"
-                else:
-                    severity = self.SEVERITY_CRITICAL
-                    description = f"S3 bucket '{bucket_name}' is publicly accessible and may contain sensitive data"
-                
-                self.findings.append({
-                    'service': 'S3',
-                    'resource': bucket_name,
-                    'severity': severity,
-                    'issue': 'Public Access Enabled',
-                    'description': description,
-                    'remediation': f"Block public access for bucket '{bucket_name}' unless absolutely necessary. "
-                                 f"Use AWS CLI: aws s3api put-public-access-block --bucket {bucket_name} "
-                                 f"--public-access-block-configuration BlockPublicAcls=true,IgnorePublicAcls=true,"
-                                 f"BlockPublicPolicy=true,RestrictPublicBuckets=true"
-                })
+        # Check if this is intentional (tagged as public website)
+        is_public_website = any(
+            tag.get('key') == 'Purpose' and 'public' in (tag.get('value') or '').lower()
+            for tag in tags
+        )
+        
+        if is_public_website:
+            severity = self.SEVERITY_LOW
+            description = f"S3 bucket '{bucket_name}' is publicly accessible (tagged as public website)"
+        else:
+            severity = self.SEVERITY_CRITICAL
+            description = f"S3 bucket '{bucket_name}' is publicly accessible and may contain sensitive data"
+        
+        add({
+            'service': 'S3',
+            'resource': bucket_name,
+            'severity': severity,
+            'issue': 'Public Access Enabled',
+            'description': description,
+            'remediation': self._REMEDIATION_PUBLIC_ACCESS.format(name=bucket_name)
+        })
     
-    def _check_encryption(self, bucket: Dict[str, Any]) -> None:
+    def _check_encryption(self, add: AddFinding, bucket_name: str, encryption: Optional[Dict[str, Any]]) -> None:
         """Check if bucket has encryption enabled"""
-        bucket_name = bucket.get('name')
-        encryption = bucket.get('encryption')
-        
         if not encryption:
             # Check bucket naming to determine sensitivity
-            sensitive_keywords = ['financial', 'customer', 'personal', 'pii', 'records', 'backup']
-            is_sensitive = any(keyword in bucket_name.lower() for keyword in sensitive_keywords)
+            is_sensitive = _SENSITIVE_ENC_RE.search(bucket_name) is not None
             
             severity = self.SEVERITY_HIGH if is_sensitive else self.SEVERITY_MEDIUM
             
-            self.findings.append({
+            add({
                 'service': 'S3',
                 'resource': bucket_name,
                 'severity': severity,
                 'issue': 'Encryption Not Enabled',
                 'description': f"S3 bucket '{bucket_name}' does not have default encryption enabled",
-                'remediation': f"Enable default encryption for bucket '{bucket_name}'. "
-                             f"Use AWS CLI: aws s3api put-bucket-encryption --bucket {bucket_name} "
-                             f"--server-side-encryption-configuration "
-                             f"'{{\"Rules\":[{{\"ApplyServerSideEncryptionByDefault\":{{\"SSEAlgorithm\":\"AES256\"}}}}]}}'"
+                'remediation': self._REMEDIATION_ENCRYPTION.format(name=bucket_name)
             })
     
-    def _check_versioning(self, bucket: Dict[str, Any]) -> None:
+    def _check_versioning(self, add: AddFinding, bucket_name: str, versioning: str) -> None:
         """Check if bucket has versioning enabled"""
-        bucket_name = bucket.get('name')
-        versioning = bucket.get('versioning', 'Disabled')
-        
         if versioning != 'Enabled':
             # Versioning is important for compliance and data recovery
-            sensitive_keywords = ['backup', 'records', 'financial', 'compliance']
-            is_critical_data = any(keyword in bucket_name.lower() for keyword in sensitive_keywords)
+            is_critical_data = _SENSITIVE_VER_RE.search(bucket_name) is not None
             
             severity = self.SEVERITY_MEDIUM if is_critical_data else self.SEVERITY_LOW
             
-            self.findings.append({
+            add({
                 'service': 'S3',
                 'resource': bucket_name,
                 'severity': severity,
                 'issue': 'Versioning Disabled',
                 'description': f"S3 bucket '{bucket_name}' does not have versioning enabled. "
                              f"This increases risk of accidental data loss.",
-                'remediation': f"Enable versioning for bucket '{bucket_name}'. "
-                             f"Use AWS CLI: aws s3api put-bucket-versioning --bucket {bucket_name} "
-                             f"--versioning-configuration Status=Enabled"
+                'remediation': self._REMEDIATION_VERSIONING.format(name=bucket_name)
             })
     
-    def _check_logging(self, bucket: Dict[str, Any]) -> None:
+    def _check_logging(self, add: AddFinding, bucket_name: str, logging: bool) -> None:
         """Check if bucket has access logging enabled"""
-        bucket_name = bucket.get('name')
-        logging = bucket.get('logging', False)
-        
         if not logging:
             # Logging is important for audit trails and compliance
-            self.findings.append({
+            add({
                 'service': 'S3',
                 'resource': bucket_name,
                 'severity': self.SEVERITY_LOW,
                 'issue': 'Access Logging Disabled',
                 'description': f"S3 bucket '{bucket_name}' does not have access logging enabled. "
                              f"This makes it difficult to audit access patterns and investigate incidents.",
-                'remediation': f"Enable access logging for bucket '{bucket_name}'. "
-                             f"First create a logging bucket, then use AWS CLI: "
-                             f"aws s3api put-bucket-logging --bucket {bucket_name} "
-                             f"--bucket-logging-status file://logging.json"
+                'remediation': self._REMEDIATION_LOGGING.format(name=bucket_name)
             })
     
-    def _check_public_policy(self, bucket: Dict[str, Any]) -> None:
+    def _check_public_policy(self, add: AddFinding, bucket_name: str, policy: Optional[Dict[str, Any]]) -> None:
         """Check if bucket has a policy that allows public access"""
-        bucket_name = bucket.get('name')
-        policy = bucket.get('bucket_policy')
-        
         if policy:
             statements = policy.get('Statement', [])
             for statement in statements:
@@ -176,30 +230,16 @@ class S3Scanner:
                 
                 # Check for wildcard principal with Allow effect
                 if principal == '*' and effect == 'Allow':
-                    self.findings.append({
+                    add({
                         'service': 'S3',
                         'resource': bucket_name,
                         'severity': self.SEVERITY_CRITICAL,
                         'issue': 'Public Bucket Policy',
                         'description': f"S3 bucket '{bucket_name}' has a bucket policy that allows public access "
                                      f"(Principal: '*'). This overrides bucket ACL settings.",
-                        'remediation': f"Review and restrict the bucket policy for '{bucket_name}'. "
-                                     f"Remove or narrow the Principal field. Consider using AWS Organizations "
-                                     f"SCPs to prevent public bucket policies."
+                        'remediation': self._REMEDIATION_PUBLIC_POLICY.format(name=bucket_name)
                     })
     
     def get_summary(self) -> Dict[str, int]:
         """Get summary of findings by severity"""
-        summary = {
-            self.SEVERITY_CRITICAL: 0,
-            self.SEVERITY_HIGH: 0,
-            self.SEVERITY_MEDIUM: 0,
-            self.SEVERITY_LOW: 0
-        }
-        
-        for finding in self.findings:
-            severity = finding.get('severity')
-            if severity in summary:
-                summary[severity] += 1
-        
-        return summary
+        return summarize(self.findings)
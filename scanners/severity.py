@@ -0,0 +1,32 @@
+"""
+Severity levels shared by all scanners
+"""
+
+from collections import Counter
+from enum import IntEnum
+from typing import Any, Dict, Iterable
+
+
+class Severity(IntEnum):
+    """Finding severity, ordered from most to least severe"""
+    
+    CRITICAL = 0
+    HIGH = 1
+    MEDIUM = 2
+    LOW = 3
+    
+    @property
+    def label(self) -> str:
+        """Severity label as it appears in findings and reports"""
+        return self.name
+    
+    @property
+    def css_class(self) -> str:
+        """CSS class used for this severity in the HTML report"""
+        return self.name.lower()
+
+
+def summarize(findings: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Count findings by severity label, including levels with no findings"""
+    counts = Counter(finding.get('severity') for finding in findings)
+    return {severity.label: counts.get(severity.label, 0) for severity in Severity}
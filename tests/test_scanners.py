@@ -5,6 +5,15 @@ Unit tests for S3 Scanner
 import pytest
 import json
 from scanners.s3_scanner import S3Scanner
+from scanners.severity import Severity, summarize
+
+
+@pytest.fixture(scope='session')
+def scan_results():
+    """Run a single mock scan shared by all tests that only inspect its results"""
+    scanner = S3Scanner(mock_mode=True)
+    findings = scanner.scan()
+    return scanner, findings, scanner.get_summary()
 
 
 class TestS3Scanner:
@@ -19,32 +28,32 @@ class TestS3Scanner:
         assert self.scanner.mock_mode is True
         assert self.scanner.findings == []
     
-    def test_scan_returns_findings(self):
+    def test_scan_returns_findings(self, scan_results):
         """Test that scan returns a list of findings"""
-        findings = self.scanner.scan()
+        _, findings, _ = scan_results
         assert isinstance(findings, list)
         assert len(findings) > 0
     
-    def test_finding_structure(self):
+    def test_finding_structure(self, scan_results):
         """Test that findings have required fields"""
-        findings = self.scanner.scan()
+        _, findings, _ = scan_results
         required_fields = ['service', 'resource', 'severity', 'issue', 'description', 'remediation']
         
         for finding in findings:
             for field in required_fields:
                 assert field in finding, f"Missing field: {field}"
     
-    def test_severity_levels(self):
+    def test_severity_levels(self, scan_results):
         """Test that all findings have valid severity levels"""
-        findings = self.scanner.scan()
+        _, findings, _ = scan_results
         valid_severities = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
         
         for finding in findings:
             assert finding['severity'] in valid_severities
     
-    def test_public_bucket_detection(self):
+    def test_public_bucket_detection(self, scan_results):
         """Test detection of publicly accessible buckets"""
-        findings = self.scanner.scan()
+        _, findings, _ = scan_results
         
         # Should detect customer-data-backup as CRITICAL
         public_findings = [f for f in findings if 'public' in f['issue'].lower()]
@@ -55,17 +64,16 @@ class TestS3Scanner:
                           if f['severity'] == 'CRITICAL' and 'customer-data' in f['resource']]
         assert len(critical_public) > 0
     
-    def test_encryption_detection(self):
+    def test_encryption_detection(self, scan_results):
         """Test detection of unencrypted buckets"""
-        findings = self.scanner.scan()
+        _, findings, _ = scan_results
         
         encryption_findings = [f for f in findings if 'encryption' in f['issue'].lower()]
         assert len(encryption_findings) > 0
     
-    def test_summary_generation(self):
+    def test_summary_generation(self, scan_results):
         """Test that summary counts findings correctly"""
-        self.scanner.scan()
-        summary = self.scanner.get_summary()
+        _, findings, summary = scan_results
         
         assert 'CRITICAL' in summary
         assert 'HIGH' in summary
@@ -78,7 +86,37 @@ class TestS3Scanner:
         
         # Verify total matches findings
         total = sum(summary.values())
-        assert total == len(self.scanner.findings)
+        assert total == len(findings)
+    
+    def test_findings_follow_bucket_order(self, scan_results):
+        """Test that findings are reported in bucket order"""
+        scanner, findings, _ = scan_results
+        bucket_names = [b['name'] for b in scanner.load_mock_data()['buckets']]
+        
+        resources = []
+        for finding in findings:
+            if finding['resource'] not in resources:
+                resources.append(finding['resource'])
+        
+        assert resources == [name for name in bucket_names if name in resources]
+    
+    def test_public_access_reported_once_per_bucket(self):
+        """Test that multiple public grants on one bucket yield a single finding"""
+        public_grant = {
+            'grantee': {'type': 'Group', 'uri': 'http://acs.amazonaws.com/groups/global/AllUsers'},
+            'permission': 'READ'
+        }
+        bucket = {
+            'name': 'shared-assets',
+            'acl': {'grants': [public_grant, dict(public_grant, permission='WRITE')]},
+            'tags': [{'key': 'Purpose', 'value': None}]
+        }
+        
+        findings = self.scanner._scan_bucket(bucket)
+        public_findings = [f for f in findings if f['issue'] == 'Public Access Enabled']
+        
+        assert len(public_findings) == 1
+        assert public_findings[0]['severity'] == 'CRITICAL'
     
     def test_mock_data_loading(self):
         """Test that mock data loads correctly"""
@@ -88,9 +126,9 @@ class TestS3Scanner:
         assert isinstance(data['buckets'], list)
         assert len(data['buckets']) > 0
     
-    def test_sensitive_bucket_detection(self):
+    def test_sensitive_bucket_detection(self, scan_results):
         """Test that sensitive buckets get higher severity"""
-        findings = self.scanner.scan()
+        _, findings, _ = scan_results
         
         # Customer data bucket should have high severity for missing encryption
         customer_findings = [f for f in findings 
@@ -100,9 +138,9 @@ class TestS3Scanner:
         if len(customer_findings) > 0:
             assert customer_findings[0]['severity'] in ['CRITICAL', 'HIGH']
     
-    def test_remediation_provided(self):
+    def test_remediation_provided(self, scan_results):
         """Test that all findings include remediation steps"""
-        findings = self.scanner.scan()
+        _, findings, _ = scan_results
         
         for finding in findings:
             assert len(finding['remediation']) > 0
@@ -110,6 +148,30 @@ class TestS3Scanner:
             assert 'aws' in finding['remediation'].lower()
 
 
+class TestSeverity:
+    """Test suite for severity levels"""
+    
+    def test_severity_ordering(self):
+        """Test that severities sort from most to least severe"""
+        assert sorted([Severity.LOW, Severity.CRITICAL, Severity.MEDIUM, Severity.HIGH]) == [
+            Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW
+        ]
+    
+    def test_severity_labels(self):
+        """Test that scanner severity constants match the enum labels"""
+        assert S3Scanner.SEVERITY_CRITICAL == Severity.CRITICAL.label == 'CRITICAL'
+        assert S3Scanner.SEVERITY_LOW == Severity.LOW.label == 'LOW'
+        assert Severity.HIGH.css_class == 'high'
+    
+    def test_summarize(self):
+        """Test that summarize counts findings without a scanner instance"""
+        findings = [{'severity': 'CRITICAL'}, {'severity': 'LOW'}, {'severity': 'LOW'}]
+        summary = summarize(findings)
+        
+        assert summary == {'CRITICAL': 1, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 2}
+        assert summarize([]) == {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+
+
 class TestS3ScannerEdgeCases:
     """Test edge cases and error handling"""
     